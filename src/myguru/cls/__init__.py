@@ -3,5 +3,6 @@
 from myguru.cls.logger import Logger
 from myguru.cls.rag_builder import RAGBuilder
 from myguru.cls.rag_query import RAGQuery
+from myguru.cls.rag_snapshot import RAGSnapshot
 
-__all__ = ["Logger", "RAGBuilder", "RAGQuery"]
+__all__ = ["Logger", "RAGBuilder", "RAGQuery", "RAGSnapshot"]
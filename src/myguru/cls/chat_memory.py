@@ -0,0 +1,226 @@
+"""
+Chat Memory.
+
+Token budgeted conversation history for guru's chat mode.
+Older turns are compressed into a running summary in background,
+so the prompt size, and the answer latency, stay flat along the session.
+"""
+
+import re
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ChatMemory:
+    """Chat Memory Class."""
+
+    # rough estimate, avoids a tokenizer dependency
+    CHARS_PER_TOKEN = 4
+
+    REUSE_CHUNKS = 3
+
+    FOLLOW_UP_MAX_WORDS = 12
+    FOLLOW_UP_STARTS = {"and", "also", "but", "then"}
+    FOLLOW_UP_PRONOUNS = {"it", "its", "them", "they"}
+    # demonstratives refer back only alone, "what does that do", not "this project"
+    FOLLOW_UP_DEMONSTRATIVES = {"this", "that", "these", "those"}
+    FOLLOW_UP_VERBS = {"is", "are", "does", "do", "mean", "means", "work", "works", "return"}
+
+    # snake_case, dotted or path names and camelCase
+    IDENTIFIER = re.compile(r"[_./]|[a-z][A-Z]")
+
+    def __init__(self, token_budget, summarize, logger):
+        """
+        Init Chat Memory Class.
+
+        Arguments:
+            - token_budget (int): Max tokens of history sent with every prompt.
+            - summarize    (callable): Receives the text to compress and the max words,
+                                       returns its summary.
+            - logger       (Logger): Logger object.
+        """
+        self.token_budget = token_budget
+        self.summarize = summarize
+        self.logger = logger
+
+        self.summary = ""
+        self.turns = []
+        self.summarizing = []
+        self.last_nodes = []
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-summary")
+        self._pending = None
+
+    def _tokens(self, text):
+        """
+        Estimate text tokens.
+
+        Arguments:
+            - text (str): Text to measure.
+
+        Returns:
+            - (int): Estimated number of tokens.
+        """
+        return len(text) // self.CHARS_PER_TOKEN + 1
+
+    def _render_turn(self, turn):
+        """
+        Format a conversation turn.
+
+        Arguments:
+            - turn (tuple): User prompt and answer.
+
+        Returns:
+            - (str): Formatted turn.
+        """
+        user_prompt, answer = turn
+        return f"[user] > {user_prompt}\n[myguru] > {answer}"
+
+    def is_follow_up(self, user_prompt):
+        """
+        Guess whether a prompt refers to the previous turn.
+
+        A prompt naming code absent from the previous turn asks about something new.
+
+        Arguments:
+            - user_prompt (str): User's prompt.
+
+        Returns:
+            - (bool): True for short prompts referring to earlier context.
+        """
+        tokens = [token.strip(string.punctuation) for token in user_prompt.split()]
+        tokens = [token for token in tokens if token]
+        if len(self.turns) == 0 or len(tokens) == 0 or len(tokens) > self.FOLLOW_UP_MAX_WORDS:
+            return False
+
+        with self._lock:
+            previous = "\n".join(self.turns[-1])
+        if any(self.IDENTIFIER.search(token) and token not in previous for token in tokens):
+            return False
+
+        words = [token.lower() for token in tokens]
+        if words[0] in self.FOLLOW_UP_STARTS:
+            return True
+        for i, word in enumerate(words):
+            if word in self.FOLLOW_UP_PRONOUNS:
+                return True
+            if word in self.FOLLOW_UP_DEMONSTRATIVES and (
+                i == len(words) - 1 or words[i + 1] in self.FOLLOW_UP_VERBS
+            ):
+                return True
+        return False
+
+    def retrieval_query(self, user_prompt):
+        """
+        Get the text to retrieve chunks with and the chunks to reuse.
+
+        A follow-up is retrieved together with the previous question and keeps the
+        best chunks already retrieved for it.
+
+        Arguments:
+            - user_prompt (str): User's prompt.
+
+        Returns:
+            - query_str (str): Text to retrieve chunks with.
+            - reused    (list): Previous turn's NodeWithScore objects to reuse.
+        """
+        if not self.is_follow_up(user_prompt):
+            return user_prompt, []
+
+        with self._lock:
+            previous_prompt, _ = self.turns[-1]
+            reused = self.last_nodes[: self.REUSE_CHUNKS]
+        return f"{previous_prompt}\n{user_prompt}", reused
+
+    def prompt(self, user_prompt):
+        """
+        Build the query with the conversation history.
+
+        Arguments:
+            - user_prompt (str): User's prompt.
+
+        Returns:
+            - (str): Query for the LLM.
+        """
+        with self._lock:
+            parts = []
+            if self.summary:
+                parts.append(f"Summary of the earlier conversation: {self.summary}")
+            parts.extend(self._render_turn(turn) for turn in self.summarizing + self.turns)
+
+        if len(parts) == 0:
+            return user_prompt
+
+        history = "\n".join(parts)
+        return f"Conversation so far:\n{history}\n\nCurrent question: {user_prompt}"
+
+    def add_turn(self, user_prompt, answer, nodes):
+        """
+        Store a conversation turn, compressing older turns if over budget.
+
+        Arguments:
+            - user_prompt (str): User's prompt.
+            - answer      (str): Guru's answer.
+            - nodes       (list): NodeWithScore objects retrieved for this turn, reused
+                                    chunks excluded so they do not pile up.
+        """
+        # a single long answer cannot take the whole budget
+        max_chars = self.token_budget * self.CHARS_PER_TOKEN // 2
+        with self._lock:
+            self.turns.append((user_prompt, answer[:max_chars]))
+            self.last_nodes = nodes
+        self._compress()
+
+    def _compress(self):
+        """Move the oldest turns over budget to a background summarization."""
+        with self._lock:
+            if self._pending is not None:
+                # re-checked once the running summary is done
+                return
+
+            # the summary takes at most a quarter of the budget
+            budget = self.token_budget - self.token_budget // 4
+            overflow = []
+            while (
+                len(self.turns) > 1
+                and sum(self._tokens(self._render_turn(turn)) for turn in self.turns) > budget
+            ):
+                overflow.append(self.turns.pop(0))
+
+            if len(overflow) == 0:
+                return
+
+            self.summarizing = overflow
+            self._pending = self._executor.submit(self._summarize_turns, self.summary, overflow)
+
+    def _summarize_turns(self, summary, turns):
+        """
+        Merge turns into the running summary.
+
+        Arguments:
+            - summary (str): Current running summary.
+            - turns   (list): Turns to merge.
+        """
+        text = "\n".join([summary, *[self._render_turn(turn) for turn in turns]]).strip()
+        max_words = self.token_budget // 4 * 3 // 4
+
+        try:
+            new_summary = self.summarize(text, max_words)
+        except Exception as err:
+            # keep the session going, just drop the oldest turns
+            self.logger.warning(f"Conversation summary failed: {err}")
+            new_summary = summary
+
+        with self._lock:
+            self.summary = new_summary[: self.token_budget * self.CHARS_PER_TOKEN // 4]
+            self.summarizing = []
+            self._pending = None
+        self.logger.debug(f"Conversation summary updated, {len(turns)} turns compressed ...")
+
+        self._compress()
+
+    def close(self):
+        """Stop background summarization."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
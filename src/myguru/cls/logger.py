@@ -1,54 +1,148 @@
 """Logger Class"""
 
+import atexit
+import json
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 import coloredlogs
 
 
+class JsonFormatter(logging.Formatter):
+    """Format log records as JSON lines."""
+
+    def format(self, record):
+        """
+        Format record.
+
+        Arguments:
+            - record (logging.LogRecord): Record to format.
+
+        Returns:
+            - (str): JSON line.
+        """
+        return json.dumps(
+            {
+                "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+                "level": record.levelname,
+                "thread": record.threadName,
+                "message": record.getMessage(),
+            }
+        )
+
+
 class Logger:
-    """Create logger object."""
+    """
+    Create logger object.
+
+    Messages are put in a queue and written to stdout by a background listener,
+    so log I/O stays off the indexing hot path. Callers printing to stdout flush
+    the queue first to keep messages in order.
+    """
+
+    _QUEUE = queue.SimpleQueue()
+    _LISTENER = None
+    _PAUSED = False
 
     def __init__(self):
-        """Initialize the logger with colored output."""
+        """Initialize the logger, configured with defaults until configure is called."""
         self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-
         self.logger.propagate = False
 
-        level_styles = {
-            "debug": {"color": "blue"},
-            "info": {"color": "green"},
-            "warning": {"color": "yellow"},
-            "error": {"color": "red"},
-            "critical": {"color": "red", "bold": True},
-        }
-
-        field_styles = {
-            "asctime": {"color": "cyan"},
-            "message": {"color": "white"},
-        }
-
-        coloredlogs.install(
-            logger=self.logger,
-            stream=sys.stdout,
-            fmt="%(asctime)s - %(levelname)s : %(message)s",
-            datefmt="%Y-%m-%d %H:%M",
-            level=logging.DEBUG,
-            level_styles=level_styles,
-            field_styles=field_styles,
-        )
+        if Logger._LISTENER is None:
+            Logger.configure()
 
         self.supress_external_logs()
 
-    def _set_level(self, level):
+    @classmethod
+    def configure(cls, level=logging.INFO, log_json=False):
         """
-        Set logging level.
+        Set logging level and output format.
+
+        Arguments:
+            - level    (int): Logging level to set.
+            - log_json (bool): Flag to write JSON lines instead of colored text.
+        """
+        if cls._LISTENER is None:
+            atexit.register(cls.stop)
+        else:
+            cls.stop()
+
+        fmt = "%(asctime)s - %(levelname)s : %(message)s"
+        datefmt = "%Y-%m-%d %H:%M"
+
+        handler = logging.StreamHandler(sys.stdout)
+        if log_json:
+            handler.setFormatter(JsonFormatter())
+        elif not sys.stdout.isatty():
+            # no ANSI codes in redirected output
+            handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+        else:
+            handler.setFormatter(
+                coloredlogs.ColoredFormatter(
+                    fmt=fmt,
+                    datefmt=datefmt,
+                    level_styles={
+                        "debug": {"color": "blue"},
+                        "info": {"color": "green"},
+                        "warning": {"color": "yellow"},
+                        "error": {"color": "red"},
+                        "critical": {"color": "red", "bold": True},
+                    },
+                    field_styles={
+                        "asctime": {"color": "cyan"},
+                        "message": {"color": "white"},
+                    },
+                )
+            )
+
+        logger = logging.getLogger(__name__)
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+        logger.addHandler(QueueHandler(cls._QUEUE))
+        logger.setLevel(level)
+
+        cls._LISTENER = QueueListener(cls._QUEUE, handler)
+        cls._LISTENER.start()
+
+    @classmethod
+    def stop(cls):
+        """Flush pending messages and stop the background listener."""
+        if cls._LISTENER is not None:
+            cls.resume()
+            cls._LISTENER.stop()
+
+    @classmethod
+    def pause(cls):
+        """Write pending messages and hold new ones until resume, e.g. while reading input."""
+        if cls._LISTENER is not None and not cls._PAUSED:
+            cls._LISTENER.stop()
+            cls._PAUSED = True
+
+    @classmethod
+    def resume(cls):
+        """Write held messages and restart the background listener."""
+        if cls._PAUSED:
+            cls._LISTENER.start()
+            cls._PAUSED = False
+
+    @classmethod
+    def flush(cls):
+        """Write pending messages, call before printing to stdout."""
+        cls.pause()
+        cls.resume()
+
+    def debug(self, mssg):
+        """
+        Print debug message.
 
         Args:
-            - level (int): Logging level to set.
+            - mssg (str): Message to log.
         """
-        self.logger.setLevel(level)
+        self.logger.debug(mssg)
 
     def info(self, mssg):
         """
@@ -57,7 +151,6 @@ class Logger:
         Args:
             - mssg (str): Message to log.
         """
-        self._set_level(logging.INFO)
         self.logger.info(mssg)
 
     def warning(self, mssg):
@@ -67,7 +160,6 @@ class Logger:
         Args:
             - mssg (str): Message to log.
         """
-        self._set_level(logging.WARNING)
         self.logger.warning(mssg)
 
     def error(self, mssg):
@@ -77,9 +169,22 @@ class Logger:
         Args:
             - mssg (str): Message to log.
         """
-        self._set_level(logging.ERROR)
         self.logger.error(mssg)
 
+    def progress(self, label, total, interval=2.0):
+        """
+        Create a rate limited progress reporter.
+
+        Arguments:
+            - label    (str): Operation name.
+            - total    (int): Number of items to process.
+            - interval (float): Minimum seconds between two progress messages.
+
+        Returns:
+            - (Progress): Progress reporter.
+        """
+        return Progress(self, label, total, interval)
+
     def supress_external_logs(self):
         """Supress verbosity logs."""
         logging.getLogger("httpcore").setLevel(logging.WARNING)
@@ -87,3 +192,46 @@ class Logger:
         logging.getLogger("urllib3").setLevel(logging.WARNING)
         logging.getLogger("chromadb").setLevel(logging.WARNING)
         logging.getLogger("llama_index").setLevel(logging.WARNING)
+
+
+class Progress:
+    """Rate limited progress reporter, logs at most once per interval."""
+
+    def __init__(self, logger, label, total, interval):
+        """
+        Init Progress Class.
+
+        Arguments:
+            - logger   (Logger): Logger object.
+            - label    (str): Operation name.
+            - total    (int): Number of items to process.
+            - interval (float): Minimum seconds between two progress messages.
+        """
+        self.logger = logger
+        self.label = label
+        self.total = total
+        self.interval = interval
+
+        self.count = 0
+        self.start = time.monotonic()
+        self.last = self.start
+
+    def update(self, item=None):
+        """
+        Advance progress by one item.
+
+        Arguments:
+            - item (str): Processed item, only logged at debug level.
+        """
+        self.count += 1
+        if item is not None:
+            self.logger.debug(f"{self.label}: {item} ...")
+
+        now = time.monotonic()
+        if now - self.last >= self.interval or self.count == self.total:
+            self.last = now
+            percent = 100 * self.count / self.total if self.total else 100
+            self.logger.info(
+                f"{self.label}: {self.count}/{self.total} ({percent:.0f}%) "
+                f"in {now - self.start:.1f}s ..."
+            )
@@ -5,6 +5,7 @@ This class initializes all the necessary parts to run
 the RAG DB builder and the RAG qwery.
 """
 
+import os
 import sys
 
 import chromadb
@@ -13,6 +14,7 @@ from llama_index.embeddings.ollama import OllamaEmbedding
 from llama_index.llms.ollama import Ollama
 
 from myguru.cls.logger import Logger
+from myguru.utils import collection_name
 
 
 class RAGBase:
@@ -22,17 +24,21 @@ class RAGBase:
 
     _IS_INIT = False
 
-    def __init__(self, tool_name, src_path, db_path, llm, cle, base_url):
+    def __init__(
+        self, tool_name, src_path, db_path, llm, cle, base_url, keep_alive="5m", project=None
+    ):
         """
         Init Base Class.
 
         Arguments:
-            - tool_name (str): Tool's name
-            - src_path  (str): Src path.
-            - db_path   (str): ChromaDB path.
-            - llm       (str): LLM model for code analysis and generation.
-            - cle       (str): Embedding model.
-            - base_url  (str): Ollama base url. url:port
+            - tool_name  (str): Tool's name
+            - src_path   (str): Src path, None to open an existing project by name.
+            - db_path    (str): ChromaDB path.
+            - llm        (str): LLM model for code analysis and generation.
+            - cle        (str): Embedding model.
+            - base_url   (str): Ollama base url. url:port
+            - keep_alive (str): How long Ollama keeps the LLM loaded after a request.
+            - project    (str): Project name inside the DB, src dir name if None.
         """
         if not self._IS_INIT:
             self.tool_name = tool_name
@@ -41,8 +47,13 @@ class RAGBase:
             self.llm = llm
             self.cle = cle
             self.base_url = base_url
+            self.keep_alive = keep_alive
+            self.project = project or os.path.basename(os.path.abspath(src_path))
 
-            self.LOGGER.info(f"INIT RAG BASE || LLM: {self.llm} || EMBEDDING MODEL: {self.cle}")
+            self.LOGGER.info(
+                f"INIT RAG BASE || PROJECT: {self.project} || LLM: {self.llm} "
+                f"|| EMBEDDING MODEL: {self.cle}"
+            )
 
             try:
                 # create our model persona
@@ -51,6 +62,7 @@ class RAGBase:
                     base_url=self.base_url,
                     temperature=0.0,
                     request_timeout=300.0,
+                    keep_alive=self.keep_alive,
                     system_prompt=(
                         f"You are {self.tool_name}, an expert code analyser and generator."
                         "You provide ONLY and STRICTLY answers refering to the project's "
@@ -89,17 +101,164 @@ class RAGBase:
                     "Answer: "
                 )
 
+                # define summaries for two-stage retrieval
+                self.summary_prompt = PromptTemplate(
+                    "Below is the content of the {kind} '{path}' of a software project.\n"
+                    "+---------------------+\n"
+                    "{content_str}\n"
+                    "+---------------------+\n"
+                    "Summarize in at most 5 sentences what this {kind} is responsible for, "
+                    "naming its main classes, functions and concepts. "
+                    "Answer ONLY with the summary."
+                )
+
+                # define conversation compression for chat mode
+                self.chat_summary_prompt = PromptTemplate(
+                    "Below is a conversation between a user and a project's assistant.\n"
+                    "+---------------------+\n"
+                    "{conversation_str}\n"
+                    "+---------------------+\n"
+                    "Summarize it in at most {max_words} words, keeping the questions asked, "
+                    "the file paths, classes and functions discussed and the conclusions. "
+                    "Answer ONLY with the summary."
+                )
+
                 # init chromaDB client
                 self.db_client = chromadb.PersistentClient(path=self.db_path)
-                self.collection_name = self.src_path.split("/")[
-                    -1
-                ]  # get project name if path given
-                self.chroma_collection = self.db_client.get_or_create_collection(
-                    name=self.collection_name
-                )
+                self.collection_name = collection_name(self.project)
+                self.summary_collection_name = f"{self.collection_name}-summaries"
+                self._adopt_legacy_collections(project)
+                # only learning and snapshot import create collections
+                self.chroma_collection = self._get_collection()
+                self.summary_collection = self._get_summary_collection()
 
                 self._IS_INIT = True
 
             except (TypeError, ConnectionError, Exception) as err:
                 self.LOGGER.error(err)
                 sys.exit(1)
+
+    def check_learned(self):
+        """Exit unless the project was learned in the DB."""
+        if self.chroma_collection is None or self.chroma_collection.count() == 0:
+            self.LOGGER.error(
+                f"Project {self.project} not found in {self.db_path}, use learning --create."
+            )
+            sys.exit(1)
+
+    def _adopt_legacy_collections(self, project):
+        """
+        Rename collections of DBs created before projects were supported.
+
+        They were named after the src dir as given in -s, leaving them in place
+        would make every operation start over with a new, empty collection.
+        Several src dirs may share that name, so a legacy collection is only adopted
+        under its own name and when its chunks come from src path.
+
+        Arguments:
+            - project (str): Project name given by the user, None if not given.
+        """
+        legacy_name = self.project if self.src_path is None else self.src_path.split("/")[-1]
+        names = [collection.name for collection in self.db_client.list_collections()]
+        if (
+            legacy_name == self.collection_name
+            or legacy_name not in names
+            or self.collection_name in names
+        ):
+            return
+
+        legacy = self.db_client.get_collection(name=legacy_name)
+        if "src" in (legacy.metadata or {}):
+            # not a legacy collection
+            return
+        if project is not None and project != legacy_name:
+            return
+        if self.src_path is not None and not self._holds_src_files(legacy):
+            self.LOGGER.warning(
+                f"Legacy collection {legacy_name} holds files outside {self.src_path}, "
+                "left untouched ..."
+            )
+            return
+
+        metadata = {"project": self.project}
+        if self.src_path is not None:
+            metadata["src"] = os.path.abspath(self.src_path)
+        legacy.modify(name=self.collection_name, metadata=metadata)
+        self.LOGGER.warning(
+            f"Renamed legacy collection {legacy_name} to {self.collection_name} ..."
+        )
+
+        legacy_summaries = f"{legacy_name}-summaries"
+        if legacy_summaries in names and self.summary_collection_name not in names:
+            self.db_client.get_collection(name=legacy_summaries).modify(
+                name=self.summary_collection_name
+            )
+
+    def _holds_src_files(self, collection):
+        """
+        Check every chunk of a collection comes from src path.
+
+        Arguments:
+            - collection (chromadb.Collection): Collection to check.
+
+        Returns:
+            - (bool): True if every chunk's file is under src path.
+        """
+        src_path = os.path.abspath(self.src_path)
+        records = collection.get(include=["metadatas"])
+        for metadata in records["metadatas"]:
+            file_path = (metadata or {}).get("file_path")
+            if file_path is None or not os.path.abspath(file_path).startswith(src_path + os.sep):
+                return False
+        return True
+
+    def _get_summary_collection(self, create=False):
+        """
+        Get the project's summaries collection.
+
+        It only exists once learning built summaries, so it is not created on read.
+
+        Arguments:
+            - create (bool): Flag to create the collection if missing.
+
+        Returns:
+            - collection (chromadb.Collection): Summaries collection, None if missing.
+        """
+        names = [collection.name for collection in self.db_client.list_collections()]
+        if create or self.summary_collection_name in names:
+            return self.db_client.get_or_create_collection(name=self.summary_collection_name)
+        return None
+
+    def _get_collection(self, create=False):
+        """
+        Get the project's collection, bound to its src path.
+
+        Two projects with the same name in one DB would mix their chunks,
+        so a collection created for another src path is refused.
+
+        Arguments:
+            - create (bool): Flag to create the collection if missing, needs src path.
+
+        Returns:
+            - collection (chromadb.Collection): Project's collection, None if missing.
+        """
+        names = [collection.name for collection in self.db_client.list_collections()]
+        if not create and self.collection_name not in names:
+            return None
+
+        if self.src_path is None:
+            return self.db_client.get_collection(name=self.collection_name)
+
+        src_path = os.path.abspath(self.src_path)
+        collection = self.db_client.get_or_create_collection(
+            name=self.collection_name, metadata={"project": self.project, "src": src_path}
+        )
+
+        owner = (collection.metadata or {}).get("src", src_path)
+        if owner != src_path:
+            self.LOGGER.error(
+                f"Project {self.project} in {self.db_path} belongs to {owner}, "
+                "use --project to pick another name."
+            )
+            sys.exit(1)
+        return collection
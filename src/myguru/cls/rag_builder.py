@@ -8,7 +8,7 @@ import os
 import sys
 from pathlib import Path
 
-from llama_index.core import VectorStoreIndex
+from llama_index.core import Document, Settings, VectorStoreIndex
 from llama_index.core.storage.storage_context import StorageContext
 from llama_index.readers.file import FlatReader
 from llama_index.vector_stores.chroma import ChromaVectorStore
@@ -20,24 +20,27 @@ from myguru.utils import md5, read_hash_file, walk_directory, write_hash_file
 class RAGBuilder(RAGBase):
     """RAG Builder Class."""
 
-    def __init__(self, tool_name, src_path, db_path, llm, cle, base_url):
+    SUMMARY_MAX_CHARS = 6000
+
+    def __init__(
+        self, tool_name, src_path, db_path, llm, cle, base_url, keep_alive="5m", project=None
+    ):
         """
         Init RAG Builder Class.
 
         Arguments:
-            - tool_name (str): Tool's name
-            - src_path  (str): Src path.
-            - db_path   (str): ChromaDB path.
-            - llm       (str): LLM model for code analysis and generation.
-            - cle       (str): Embedding model.
-            - base_url  (str): Ollama base url. url:port
+            - tool_name  (str): Tool's name
+            - src_path   (str): Src path, None to open an existing project by name.
+            - db_path    (str): ChromaDB path.
+            - llm        (str): LLM model for code analysis and generation.
+            - cle        (str): Embedding model.
+            - base_url   (str): Ollama base url. url:port
+            - keep_alive (str): How long Ollama keeps the LLM loaded after a request.
+            - project    (str): Project name inside the DB, src dir name if None.
         """
-        super().__init__(tool_name, src_path, db_path, llm, cle, base_url)
-
-        self.vector_store = ChromaVectorStore(chroma_collection=self.chroma_collection)
-        self.storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
+        super().__init__(tool_name, src_path, db_path, llm, cle, base_url, keep_alive, project)
 
-    def setup_index(self, hash_file, exclude, exclude_all, exclude_ext):
+    def setup_index(self, hash_file, exclude, exclude_all, exclude_ext, summaries=False):
         """
         Create persistent VectorStoreIndex.
 
@@ -46,8 +49,12 @@ class RAGBuilder(RAGBase):
             - exclude     (list): List of files or directories to exclude.
             - exclude_all (list): List of files or directories to exclude in all subpaths.
             - exclude_ext (list): List of extensions to exclude in all subpaths.
+            - summaries   (bool): Flag to also index file and directory summaries.
 
         """
+        if self.chroma_collection is None:
+            self.chroma_collection = self._get_collection(create=True)
+
         if self.chroma_collection.count() == 0:
             self.LOGGER.info(f"Starting indexing || src: {self.src_path} || DB: {self.db_path} ...")
 
@@ -59,8 +66,9 @@ class RAGBuilder(RAGBase):
             # walk src
             try:
                 all_files.extend(walk_directory(self.src_path, exclude, exclude_all, exclude_ext))
+                progress = self.LOGGER.progress("Parsing files", len(all_files))
                 for file in all_files:
-                    self.LOGGER.info(f"Parsing file: {file} ...")
+                    progress.update(file)
 
                     file_path_obj = Path(file)
                     docs = text_parser.load_data(file=file_path_obj)
@@ -71,13 +79,17 @@ class RAGBuilder(RAGBase):
                         doc.set_content(f"File Path: {doc.doc_id}\n\n{doc.text}")
                         all_documents.append(doc)
 
+                vector_store = ChromaVectorStore(chroma_collection=self.chroma_collection)
                 _ = VectorStoreIndex.from_documents(
-                    all_documents, storage_context=self.storage_context
+                    all_documents,
+                    storage_context=StorageContext.from_defaults(vector_store=vector_store),
                 )
             except (FileNotFoundError, PermissionError, Exception) as err:
                 self.LOGGER.error(err)
                 sys.exit(1)
             self.LOGGER.info("Indexing completed! ...")
+            if summaries:
+                self._refresh_summaries(all_files)
             self._create_project_hash_file(hash_file, all_files)
         else:
             self.LOGGER.error("DB already exists, use update operation.")
@@ -118,13 +130,146 @@ class RAGBuilder(RAGBase):
 
         try:
             index = VectorStoreIndex.from_vector_store(
-                vector_store=self.vector_store,
+                vector_store=ChromaVectorStore(chroma_collection=self.chroma_collection),
+            )
+            return index
+        except (FileNotFoundError, PermissionError, Exception) as err:
+            self.LOGGER.error(err)
+            sys.exit(1)
+
+    def get_summary_index(self):
+        """
+        Retrieve summaries VectorStoreIndex index.
+
+        Returns:
+            - index (VectorStoreIndex): Summaries index object.
+        """
+        self.LOGGER.info(f"Loading existing Summaries Index from disk: {self.db_path} ...")
+
+        try:
+            index = VectorStoreIndex.from_vector_store(
+                vector_store=ChromaVectorStore(chroma_collection=self.summary_collection),
             )
             return index
         except (FileNotFoundError, PermissionError, Exception) as err:
             self.LOGGER.error(err)
             sys.exit(1)
 
+    def _summarize(self, kind, path, content):
+        """
+        Summarize a file or directory with the LLM.
+
+        Arguments:
+            - kind    (str): 'file' or 'directory'.
+            - path    (str): File or directory path.
+            - content (str): File content or children summaries.
+
+        Returns:
+            - summary (str): Short summary.
+        """
+        prompt = self.summary_prompt.format(
+            kind=kind, path=path, content_str=content[: self.SUMMARY_MAX_CHARS]
+        )
+        return str(Settings.llm.complete(prompt)).strip()
+
+    def _ancestor_dirs(self, path):
+        """
+        Get the directories above a path, src path itself excluded.
+
+        Arguments:
+            - path (str): File or directory path.
+
+        Returns:
+            - dirs (list): Directory paths, top level first.
+        """
+        src_path = os.path.normpath(self.src_path)
+        dirs = []
+        dir_path = os.path.dirname(path)
+        while dir_path and dir_path != src_path and dir_path != os.path.dirname(dir_path):
+            dirs.append(dir_path)
+            dir_path = os.path.dirname(dir_path)
+        return dirs[::-1]
+
+    def _summary_dirs(self, files):
+        """
+        Get every directory holding the given files, below src path.
+
+        The src path summary would describe the whole project and match any query,
+        so it is never summarized.
+
+        Arguments:
+            - files (list): List of file paths.
+
+        Returns:
+            - (list): Directory paths, deepest first so children are summarized first.
+        """
+        dirs = set()
+        for file in files:
+            dirs.update(self._ancestor_dirs(file))
+        return sorted(dirs, key=lambda dir_path: dir_path.count(os.sep), reverse=True)
+
+    def _refresh_summaries(self, files):
+        """
+        Create or refresh the summaries of the given files and their directories.
+
+        Directory summaries are built from their children summaries already stored.
+
+        Arguments:
+            - files (list): List of file paths.
+        """
+        if self.summary_collection is None:
+            self.summary_collection = self._get_summary_collection(create=True)
+        summary_index = self.get_summary_index()
+
+        try:
+            progress = self.LOGGER.progress("Summarizing files", len(files))
+            for file in files:
+                progress.update(file)
+                with open(file, "r", encoding="utf-8", errors="ignore") as pfile:
+                    summary = self._summarize("file", file, pfile.read())
+                self._upsert_summary(summary_index, "file", file, summary)
+
+            summary_dirs = self._summary_dirs(files)
+            progress = self.LOGGER.progress("Summarizing directories", len(summary_dirs))
+            for dir_path in summary_dirs:
+                progress.update(dir_path)
+                children = self.summary_collection.get(
+                    where={"dir": dir_path}, include=["documents"]
+                )
+                summary = self._summarize("directory", dir_path, "\n\n".join(children["documents"]))
+                self._upsert_summary(summary_index, "dir", dir_path, summary)
+        except (FileNotFoundError, PermissionError, Exception) as err:
+            self.LOGGER.error(err)
+            sys.exit(1)
+
+    def _upsert_summary(self, summary_index, kind, path, summary):
+        """
+        Replace a summary in the summaries index.
+
+        Arguments:
+            - summary_index (VectorStoreIndex): Summaries index object.
+            - kind          (str): 'file' or 'dir'.
+            - path          (str): File or directory path.
+            - summary       (str): Short summary.
+        """
+        metadata = {"kind": kind, "path": path, "dir": os.path.dirname(path)}
+
+        # dir_<depth> keys let a query keep everything under a directory
+        ancestors = self._ancestor_dirs(path)
+        for depth, dir_path in enumerate(ancestors, start=1):
+            metadata[f"dir_{depth}"] = dir_path
+        if kind == "dir":
+            metadata["depth"] = len(ancestors) + 1
+        elif len(ancestors) == 0:
+            # files directly under src path have no dir_<depth> key to be picked by
+            metadata["root"] = 1
+
+        doc = Document(text=f"{kind.title()} Path: {path}\n\n{summary}", metadata=metadata)
+        doc.doc_id = f"{kind}:{path}"
+
+        summary_index.delete_ref_doc(doc.doc_id, delete_from_docstore=True)
+        summary_index.insert(doc)
+
     def update_index(self, hash_file):
         """
         Update persistent VectorStoreIndex.
@@ -135,6 +280,8 @@ class RAGBuilder(RAGBase):
         Arguments:
             - hash_file   (str): Hash File path.
         """
+        self.check_learned()
+
         update_files = self._update_project_hash_file(hash_file)
         if len(update_files) == 0:
             self.LOGGER.info("Nothing to update ...")
@@ -143,6 +290,7 @@ class RAGBuilder(RAGBase):
         index = self.get_index()
         text_parser = FlatReader()
 
+        progress = self.LOGGER.progress("Updating index", len(update_files))
         for file in update_files:
             file_path_obj = Path(file)
             docs = text_parser.load_data(file=file_path_obj)
@@ -152,18 +300,17 @@ class RAGBuilder(RAGBase):
                 doc.doc_id = doc.metadata["file_path"]
                 doc.set_content(f"File Path: {doc.doc_id}\n\n{doc.text}")
 
-            self.LOGGER.info(f"Updating index for file: {file} ...")
-
-            self.LOGGER.info("Deleting old index.")
             index.delete_ref_doc(doc.doc_id, delete_from_docstore=True)
-            self.LOGGER.info("Deletion successful.")
-
-            self.LOGGER.info("Insert new version.")
             index.insert(doc)
 
             index.storage_context.persist(self.db_path)
 
-            self.LOGGER.info("Successfull Update.")
+            progress.update(file)
+
+        self.LOGGER.info("Successfull Update.")
+
+        if self.summary_collection is not None and self.summary_collection.count() > 0:
+            self._refresh_summaries(update_files)
 
     def _update_project_hash_file(self, hash_file):
         """
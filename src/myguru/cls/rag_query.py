@@ -5,67 +5,337 @@ Query RAG agent in conversation/user mode.
 """
 
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from llama_index.core import QueryBundle, Settings, get_response_synthesizer
+from llama_index.core.vector_stores import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+
+from myguru.cls.chat_memory import ChatMemory
 from myguru.cls.rag_base import RAGBase
 
 
 class RAGQuery(RAGBase):
     """RAG Query Class."""
 
-    def __init__(self, tool_name, src_path, db_path, llm, cle, base_url, index):
+    TOP_CHUNKS = 5
+    TOP_DIRS = 3
+    TOP_FILES = 10
+
+    def __init__(self, tool_name, db_path, llm, cle, base_url, builders, keep_alive):
         """
         Init RAG Query Class.
 
+        Starts loading every project's indexes and warming up both models in background
+        threads, so the user's prompt is shown while Ollama loads them.
+
+        Arguments:
+            - tool_name  (str): Tool's name
+            - db_path    (str): ChromaDB path.
+            - llm        (str): LLM model for code analysis and generation.
+            - cle        (str): Embedding model.
+            - base_url   (str): Ollama base url. url:port
+            - builders   (dict): Project name -> RAGBuilder object, one per queried project.
+            - keep_alive (str): How long Ollama keeps the LLM loaded after a request.
+        """
+        for builder in builders.values():
+            builder.check_learned()
+
+        first = next(iter(builders.values()))
+        super().__init__(
+            tool_name, first.src_path, db_path, llm, cle, base_url, keep_alive, first.project
+        )
+
+        self.builders = builders
+        self.indexes = {}
+        self.summary_indexes = {}
+
+        self._warm_up_executor = ThreadPoolExecutor(
+            max_workers=2 + 2 * len(builders), thread_name_prefix="warm-up"
+        )
+        self._warm_up_futures = {
+            "embedding": self._warm_up_executor.submit(self._timed, "embedding", self._warm_embed),
+            "llm": self._warm_up_executor.submit(self._timed, "llm", self._warm_llm),
+        }
+        for project, builder in builders.items():
+            self._warm_up_futures[f"index:{project}"] = self._warm_up_executor.submit(
+                self._timed, f"index {project}", builder.get_index
+            )
+            # two-stage retrieval only when learning generated summaries
+            summary_collection = builder.summary_collection
+            if summary_collection is not None and summary_collection.count() > 0:
+                self._warm_up_futures[f"summaries:{project}"] = self._warm_up_executor.submit(
+                    self._timed, f"summaries {project}", builder.get_summary_index
+                )
+
+        self._retrieval_executor = ThreadPoolExecutor(
+            max_workers=len(builders), thread_name_prefix="retrieval"
+        )
+
+    def _timed(self, name, func):
+        """
+        Run a warm-up task and log how long it took.
+
+        Arguments:
+            - name (str): Warm-up task name.
+            - func (callable): Warm-up task.
+
+        Returns:
+            - func's return value.
+        """
+        start = time.perf_counter()
+        result = func()
+        self.LOGGER.info(f"Warm-up {name} ready in {time.perf_counter() - start:.2f}s ...")
+        return result
+
+    def _warm_embed(self):
+        """Load the embedding model into Ollama's memory."""
+        Settings.embed_model.get_query_embedding("warm-up")
+
+    def _warm_llm(self):
+        """
+        Load the LLM into Ollama's memory.
+
+        Ollama only loads the model for a chat request without messages, a completion,
+        even with an empty prompt, runs a full generation the first query waits for.
+        """
+        Settings.llm.client.chat(model=self.llm, messages=[], keep_alive=self.keep_alive)
+
+    def _wait_warm_up(self):
+        """
+        Wait for pending warm-up tasks.
+
+        A failing index load is fatal, failing model warm-ups are not since the
+        first query will load the models anyway.
+        """
+        for name in ["embedding", "llm"]:
+            try:
+                self._warm_up_futures[name].result()
+            except Exception as err:
+                self.LOGGER.warning(f"Warm-up {name} failed: {err}")
+
+        for project in self.builders:
+            if f"summaries:{project}" in self._warm_up_futures:
+                self.summary_indexes[project] = self._warm_up_futures[
+                    f"summaries:{project}"
+                ].result()
+
+            self.indexes[project] = self._warm_up_futures[f"index:{project}"].result()
+
+        self._warm_up_executor.shutdown(wait=False)
+
+    def _retrieve(self, query_str, debug):
+        """
+        Retrieve the closest chunks to a query from every project at once.
+
+        Every collection uses the same embedding model, so projects are merged
+        on their raw scores.
+
+        Arguments:
+            - query_str (str): Text to retrieve chunks with.
+            - debug     (bool): Flag to show the retrieval scope and latency.
+
+        Returns:
+            - (list): Retrieved NodeWithScore objects, best first.
+        """
+        # embed once, reused by every project and retrieval stage
+        query_bundle = QueryBundle(
+            query_str=query_str,
+            embedding=Settings.embed_model.get_query_embedding(query_str),
+        )
+
+        futures = {
+            project: self._retrieval_executor.submit(
+                self._retrieve_project, project, query_bundle, debug
+            )
+            for project in self.builders
+        }
+
+        nodes = []
+        for project, future in futures.items():
+            project_nodes, elapsed = future.result()
+            if debug:
+                self.LOGGER.warning(
+                    f"Retrieved {len(project_nodes)} chunks from {project} in {elapsed:.2f}s ..."
+                )
+            for node in project_nodes:
+                node.node.metadata["project"] = project
+            nodes.extend(project_nodes)
+
+        nodes.sort(key=lambda node: node.score or 0.0, reverse=True)
+        return nodes[: self.TOP_CHUNKS]
+
+    def _retrieve_project(self, project, query_bundle, debug):
+        """
+        Retrieve the closest chunks to a query from one project.
+
+        With summaries, the search is restricted to the files picked by _scope_files.
+
         Arguments:
-            - tool_name (str): Tool's name
-            - src_path  (str): Src path.
-            - db_path   (str): ChromaDB path.
-            - llm       (str): LLM model for code analysis and generation.
-            - cle       (str): Embedding model.
-            - base_url  (str): Ollama base url. url:port
-            - index     (VectorStoreIndex): Index object.
+            - project      (str): Project name.
+            - query_bundle (QueryBundle): User's query with its embedding.
+            - debug        (bool): Flag to show the retrieval scope.
+
+        Returns:
+            - nodes   (list): Retrieved NodeWithScore objects.
+            - elapsed (float): Retrieval seconds.
+        """
+        start = time.perf_counter()
+
+        filters = None
+        if project in self.summary_indexes:
+            files = self._scope_files(project, query_bundle)
+            if debug:
+                self.LOGGER.warning(f"Retrieval scope {project}: {files} ...")
+
+            if len(files) != 0:
+                filters = MetadataFilters(
+                    filters=[
+                        MetadataFilter(key="file_path", value=files, operator=FilterOperator.IN)
+                    ]
+                )
+
+        retriever = self.indexes[project].as_retriever(
+            similarity_top_k=self.TOP_CHUNKS, filters=filters
+        )
+        nodes = retriever.retrieve(query_bundle)
+        return nodes, time.perf_counter() - start
+
+    def _summarize_chat(self, conversation, max_words):
         """
-        super().__init__(tool_name, src_path, db_path, llm, cle, base_url)
+        Summarize conversation turns with the LLM.
 
-        self.index = index
+        Arguments:
+            - conversation (str): Running summary and turns to compress.
+            - max_words    (int): Max summary length.
 
-    def run_query(self, debug):
+        Returns:
+            - (str): Conversation summary.
+        """
+        prompt = self.chat_summary_prompt.format(conversation_str=conversation, max_words=max_words)
+        return str(Settings.llm.complete(prompt)).strip()
+
+    def _scope_files(self, project, query_bundle):
+        """
+        Pick the files relevant to a query using the project's summaries index.
+
+        First retrieves the closest directories, then the closest files under them.
+
+        Arguments:
+            - project      (str): Project name.
+            - query_bundle (QueryBundle): User's query with its embedding.
+
+        Returns:
+            - files (list): Relevant file paths, empty if no scope could be found.
+        """
+        summary_index = self.summary_indexes[project]
+
+        dir_retriever = summary_index.as_retriever(
+            similarity_top_k=self.TOP_DIRS,
+            filters=MetadataFilters(filters=[MetadataFilter(key="kind", value="dir")]),
+        )
+        top_dirs = dir_retriever.retrieve(query_bundle)
+        if len(top_dirs) == 0:
+            return []
+
+        # files anywhere under a picked directory, through their dir_<depth> keys,
+        # and files directly under src path, which no directory summary covers
+        under_top_dirs = MetadataFilters(
+            filters=[
+                *[
+                    MetadataFilter(key=f"dir_{node.metadata['depth']}", value=node.metadata["path"])
+                    for node in top_dirs
+                ],
+                MetadataFilter(key="root", value=1),
+            ],
+            condition=FilterCondition.OR,
+        )
+
+        file_retriever = summary_index.as_retriever(
+            similarity_top_k=self.TOP_FILES,
+            filters=MetadataFilters(
+                filters=[
+                    MetadataFilter(key="kind", value="file"),
+                    under_top_dirs,
+                ]
+            ),
+        )
+        return [node.metadata["path"] for node in file_retriever.retrieve(query_bundle)]
+
+    def run_query(self, debug, chat=False, history_tokens=1024):
         """
         Execute RAG agent's query.
 
         Arguments:
-            - debug (bool): Flag to show chunk mnessages.
+            - debug          (bool): Flag to show chunk mnessages.
+            - chat           (bool): Flag to answer with the conversation history.
+            - history_tokens (int): Max tokens of history sent with every prompt.
         """
-        self.LOGGER.info("Starting Query operation ...")
+        self.LOGGER.info(f"Starting Query operation || projects: {', '.join(self.builders)} ...")
+
+        memory = None
+        if chat:
+            memory = ChatMemory(history_tokens, self._summarize_chat, self.LOGGER)
 
         try:
-            query_engine = self.index.as_query_engine(
-                similarity_top_k=5,
-                text_qa_template=self.qa_prompt,
-                response_mode="compact",
-                response_synthesizer_mode="compact",
+            synthesizer = get_response_synthesizer(
+                text_qa_template=self.qa_prompt, response_mode="compact"
             )
 
-            self.LOGGER.info("Query engine mode ...")
+            self.LOGGER.info("Conversation mode ..." if chat else "Query engine mode ...")
 
             while True:
+                # background messages wait until the prompt is answered
+                self.LOGGER.pause()
                 user_prompt = input("[user] > ")
+                self.LOGGER.resume()
                 if user_prompt.lower() in ["quit", "exit"]:
                     self.LOGGER.info("Exiting user's session ...")
                     break
 
-                response = query_engine.query(user_prompt)
+                if len(self.indexes) == 0:
+                    self._wait_warm_up()
+
+                if memory is None:
+                    nodes = self._retrieve(user_prompt, debug)
+                    response = synthesizer.synthesize(user_prompt, nodes)
+                else:
+                    query_str, reused = memory.retrieval_query(user_prompt)
+                    fresh = self._retrieve(query_str, debug)
+
+                    # chunks the follow-up refers to go first
+                    seen = {node.node_id for node in reused}
+                    nodes = reused + [node for node in fresh if node.node_id not in seen]
+                    nodes = nodes[: self.TOP_CHUNKS + ChatMemory.REUSE_CHUNKS]
+
+                    response = synthesizer.synthesize(memory.prompt(user_prompt), nodes)
+                    memory.add_turn(user_prompt, str(response), fresh)
 
+                self.LOGGER.flush()
                 print(f"[myguru] > {response}")
                 print("_" * 25)
 
                 if debug:
                     self.LOGGER.warning("Retrieved context chunks ...")
+                    self.LOGGER.flush()
                     for i, node in enumerate(response.source_nodes):
                         print(f"Chunk {i+1} (Score: {node.score:.4f}):")
-                        print(f"Source: {node.metadata.get('file_path', 'N/A')}")
+                        print(
+                            f"Source: {node.metadata.get('project', 'N/A')} || "
+                            f"{node.metadata.get('file_path', 'N/A')}"
+                        )
                         print(node.get_content().strip())
                         print("--------------------------------")
         except (TimeoutError, Exception) as err:
             self.LOGGER.error(err)
             sys.exit(1)
+        finally:
+            self._warm_up_executor.shutdown(wait=False, cancel_futures=True)
+            self._retrieval_executor.shutdown(wait=False, cancel_futures=True)
+            if memory is not None:
+                memory.close()
@@ -0,0 +1,370 @@
+"""
+RAG Snapshot.
+
+Export and import a project's vector DB as a portable compressed archive,
+so a guru can be shared without embedding the whole project again.
+Paths are stored relative to src path and rebased on the importer's src path.
+"""
+
+import json
+import os
+import re
+import sys
+import tarfile
+import tempfile
+
+from myguru.cls.rag_base import RAGBase
+from myguru.utils import read_hash_file, sha256, write_hash_file
+
+
+class RAGSnapshot(RAGBase):
+    """RAG Snapshot Class."""
+
+    FORMAT_VERSION = 2
+
+    BATCH_SIZE = 1000
+
+    MANIFEST = "manifest.json"
+    HASH_FILE = "hashes.json"
+    CHUNKS = "chunks.jsonl"
+    SUMMARIES = "summaries.jsonl"
+
+    # metadata holding project paths, summaries doc ids are prefixed with their kind
+    PATH_KEYS = re.compile(r"^(file_path|path|dir|dir_\d+|doc_id|document_id|ref_doc_id)$")
+    ID_PREFIXES = ["file:", "dir:"]
+    DOCUMENT_PATH = re.compile(r"^((?:File|Dir) Path: )(.*)")
+
+    def __init__(self, tool_name, src_path, db_path, llm, cle, base_url, project=None):
+        """
+        Init RAG Snapshot Class.
+
+        Arguments:
+            - tool_name (str): Tool's name
+            - src_path  (str): Src path.
+            - db_path   (str): ChromaDB path.
+            - llm       (str): LLM model for code analysis and generation.
+            - cle       (str): Embedding model.
+            - base_url  (str): Ollama base url. url:port
+            - project   (str): Project name inside the DB, src dir name if None.
+        """
+        super().__init__(tool_name, src_path, db_path, llm, cle, base_url, project=project)
+
+    def export_snapshot(self, archive, hash_file):
+        """
+        Pack vector collections, hash file and embedding model metadata.
+
+        Arguments:
+            - archive   (str): Snapshot archive path, tar.gz.
+            - hash_file (str): Hash File path.
+        """
+        if self.chroma_collection is None or self.chroma_collection.count() == 0:
+            self.LOGGER.error("DB is empty, nothing to export.")
+            sys.exit(1)
+
+        self.LOGGER.info(f"Exporting snapshot || DB: {self.db_path} || archive: {archive} ...")
+
+        try:
+            # archive member name -> chroma collection
+            collections = {self.CHUNKS: self.chroma_collection}
+            if self.summary_collection is not None:
+                collections[self.SUMMARIES] = self.summary_collection
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                manifest = {
+                    "format_version": self.FORMAT_VERSION,
+                    "cle": self.cle,
+                    "counts": {},
+                    "checksums": {},
+                }
+
+                for member, collection in collections.items():
+                    member_path = os.path.join(tmp_dir, member)
+                    count = self._dump_collection(collection, member_path)
+                    manifest["counts"][member] = count
+                    self.LOGGER.info(f"Exported {count} records from {collection.name} ...")
+
+                hashes = {
+                    self._to_relative(file): file_hash
+                    for file, file_hash in read_hash_file(hash_file).items()
+                }
+                write_hash_file(os.path.join(tmp_dir, self.HASH_FILE), hashes)
+
+                for member in [*collections, self.HASH_FILE]:
+                    manifest["checksums"][member] = sha256(os.path.join(tmp_dir, member))
+
+                with open(os.path.join(tmp_dir, self.MANIFEST), "w", encoding="utf-8") as pfile:
+                    json.dump(manifest, pfile, indent=2)
+
+                with tarfile.open(archive, "w:gz") as tar:
+                    for member in [self.MANIFEST, *manifest["checksums"]]:
+                        tar.add(os.path.join(tmp_dir, member), arcname=member)
+        except (FileNotFoundError, PermissionError, Exception) as err:
+            self.LOGGER.error(err)
+            sys.exit(1)
+
+        self.LOGGER.info("Export completed! ...")
+
+    def import_snapshot(self, archive, hash_file, force):
+        """
+        Load a snapshot archive into the DB path.
+
+        Arguments:
+            - archive   (str): Snapshot archive path, tar.gz.
+            - hash_file (str): Hash File path to create.
+            - force     (bool): Import even if the embedding model differs.
+        """
+        if self.chroma_collection is not None and self.chroma_collection.count() != 0:
+            self.LOGGER.error("DB already exists, use a new DB path.")
+            sys.exit(1)
+
+        if os.path.exists(hash_file):
+            self.LOGGER.error(f"Hash file {hash_file} already exists, use a new -f path.")
+            sys.exit(1)
+
+        self.LOGGER.info(f"Importing snapshot || archive: {archive} || DB: {self.db_path} ...")
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                with tarfile.open(archive, "r:gz") as tar:
+                    tar.extractall(tmp_dir, filter="data")
+
+                with open(os.path.join(tmp_dir, self.MANIFEST), "r", encoding="utf-8") as pfile:
+                    manifest = json.load(pfile)
+
+                self._check_manifest(manifest, tmp_dir, force)
+
+                hashes = {
+                    self._to_src(file): file_hash
+                    for file, file_hash in read_hash_file(
+                        os.path.join(tmp_dir, self.HASH_FILE)
+                    ).items()
+                }
+                self._check_files(hashes)
+
+                self.chroma_collection = self._get_collection(create=True)
+
+                for member, count in manifest["counts"].items():
+                    if count == 0:
+                        continue
+                    collection = self.chroma_collection
+                    if member == self.SUMMARIES:
+                        self.summary_collection = self._get_summary_collection(create=True)
+                        collection = self.summary_collection
+                    count = self._load_collection(collection, os.path.join(tmp_dir, member))
+                    self.LOGGER.info(f"Imported {count} records into {collection.name} ...")
+
+                write_hash_file(hash_file, hashes)
+        except (FileNotFoundError, PermissionError, tarfile.TarError, Exception) as err:
+            self.LOGGER.error(err)
+            sys.exit(1)
+
+        self.LOGGER.info(f"Import completed! Run learning --update -f {hash_file} ...")
+
+    def _check_manifest(self, manifest, tmp_dir, force):
+        """
+        Validate snapshot version, checksums and embedding model.
+
+        Arguments:
+            - manifest (dict): Snapshot manifest.
+            - tmp_dir  (str): Extracted archive directory.
+            - force    (bool): Import even if the embedding model differs.
+        """
+        if manifest.get("format_version") != self.FORMAT_VERSION:
+            self.LOGGER.error(
+                f"Unsupported snapshot version {manifest.get('format_version')}, "
+                f"expected {self.FORMAT_VERSION}."
+            )
+            sys.exit(1)
+
+        for member, checksum in manifest["checksums"].items():
+            if sha256(os.path.join(tmp_dir, member)) != checksum:
+                self.LOGGER.error(f"Checksum mismatch for {member}, snapshot is corrupted.")
+                sys.exit(1)
+
+        if manifest["cle"] != self.cle:
+            mssg = (
+                f"Snapshot embedding model {manifest['cle']} differs from --cle {self.cle}, "
+                "queries would not match the stored vectors"
+            )
+            if not force:
+                self.LOGGER.error(f"{mssg}. Use --force to import anyway.")
+                sys.exit(1)
+            self.LOGGER.warning(f"{mssg} ...")
+
+    def _check_files(self, hashes):
+        """
+        Check every snapshot file exists under the importer's src path.
+
+        Arguments:
+            - hashes (dict): Rebased hash file content.
+        """
+        missing = [file for file in hashes if not os.path.isfile(file)]
+        if len(missing) != 0:
+            self.LOGGER.error(
+                f"{len(missing)} snapshot files not found under src {self.src_path}, "
+                f"e.g. {', '.join(missing[:3])}. Check -s points to the same project's src."
+            )
+            sys.exit(1)
+
+    def _to_relative(self, path):
+        """
+        Make a project path relative to src path.
+
+        Arguments:
+            - path (str): Path as indexed by learning.
+
+        Returns:
+            - (str): Path relative to src path, '.' for src path itself.
+        """
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.src_path))
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            raise ValueError(
+                f"{path} is not under src {self.src_path}, use the src used for learning."
+            )
+        return relative
+
+    def _to_src(self, path):
+        """
+        Rebase a path relative to src path on the importer's src path.
+
+        Arguments:
+            - path (str): Path relative to src path.
+
+        Returns:
+            - (str): Path as learning indexes it with this src path.
+        """
+        return os.path.normpath(os.path.join(self.src_path, path))
+
+    def _rebase_path(self, value, rebase):
+        """
+        Rebase a path metadata value, keeping its doc id prefix.
+
+        Arguments:
+            - value  (str): Metadata value.
+            - rebase (callable): Path rebasing function.
+
+        Returns:
+            - (str): Rebased value.
+        """
+        for prefix in self.ID_PREFIXES:
+            if value.startswith(prefix):
+                return prefix + rebase(value[len(prefix) :])
+        return rebase(value)
+
+    def _rebase_metadata(self, metadata, rebase):
+        """
+        Rebase every path of a metadata dictionary.
+
+        Arguments:
+            - metadata (dict): Metadata, updated in place.
+            - rebase   (callable): Path rebasing function.
+        """
+        for key, value in metadata.items():
+            if isinstance(value, str) and self.PATH_KEYS.match(key):
+                metadata[key] = self._rebase_path(value, rebase)
+
+    def _rebase_record(self, record, rebase):
+        """
+        Rebase every path of a collection record.
+
+        Paths live in the flat metadata, in the serialized node kept by llama-index
+        and in the first line of the document text.
+
+        Arguments:
+            - record (dict): Collection record, updated in place.
+            - rebase (callable): Path rebasing function.
+        """
+        metadata = record["metadata"]
+        self._rebase_metadata(metadata, rebase)
+
+        if "_node_content" in metadata:
+            node = json.loads(metadata["_node_content"])
+            self._rebase_metadata(node.get("metadata", {}), rebase)
+            for relation in node.get("relationships", {}).values():
+                if isinstance(relation, dict):
+                    relation["node_id"] = self._rebase_path(relation["node_id"], rebase)
+                    self._rebase_metadata(relation.get("metadata", {}), rebase)
+            metadata["_node_content"] = json.dumps(node)
+
+        if record["document"] is not None:
+            record["document"] = self.DOCUMENT_PATH.sub(
+                lambda match: match.group(1) + rebase(match.group(2)), record["document"], count=1
+            )
+
+    def _dump_collection(self, collection, member_path):
+        """
+        Write a chroma collection as JSON lines, one record per line.
+
+        Arguments:
+            - collection  (chromadb.Collection): Collection to export.
+            - member_path (str): Output file path.
+
+        Returns:
+            - count (int): Number of exported records.
+        """
+        count = 0
+        with open(member_path, "w", encoding="utf-8") as pfile:
+            while True:
+                batch = collection.get(
+                    offset=count,
+                    limit=self.BATCH_SIZE,
+                    include=["embeddings", "documents", "metadatas"],
+                )
+                if len(batch["ids"]) == 0:
+                    break
+
+                for i, record_id in enumerate(batch["ids"]):
+                    record = {
+                        "id": record_id,
+                        "embedding": [float(value) for value in batch["embeddings"][i]],
+                        "document": batch["documents"][i],
+                        "metadata": batch["metadatas"][i],
+                    }
+                    self._rebase_record(record, self._to_relative)
+                    pfile.write(json.dumps(record) + "\n")
+                count += len(batch["ids"])
+        return count
+
+    def _load_collection(self, collection, member_path):
+        """
+        Add JSON lines records to a chroma collection in batches.
+
+        Arguments:
+            - collection  (chromadb.Collection): Collection to fill.
+            - member_path (str): Input file path.
+
+        Returns:
+            - count (int): Number of imported records.
+        """
+        count = 0
+        batch = []
+        with open(member_path, "r", encoding="utf-8") as pfile:
+            for line in pfile:
+                record = json.loads(line)
+                self._rebase_record(record, self._to_src)
+                batch.append(record)
+                if len(batch) == self.BATCH_SIZE:
+                    count += self._add_batch(collection, batch)
+                    batch = []
+        if len(batch) != 0:
+            count += self._add_batch(collection, batch)
+        return count
+
+    def _add_batch(self, collection, batch):
+        """
+        Add records to a chroma collection.
+
+        Arguments:
+            - collection (chromadb.Collection): Collection to fill.
+            - batch      (list): Records to add.
+
+        Returns:
+            - (int): Number of added records.
+        """
+        collection.add(
+            ids=[record["id"] for record in batch],
+            embeddings=[record["embedding"] for record in batch],
+            documents=[record["document"] for record in batch],
+            metadatas=[record["metadata"] for record in batch],
+        )
+        return len(batch)
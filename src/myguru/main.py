@@ -12,11 +12,12 @@ limitations.
 """
 
 import argparse
+import logging
 import sys
 
 import maginner
 
-from myguru.cls import Logger, RAGBuilder, RAGQuery
+from myguru.cls import Logger, RAGBuilder, RAGQuery, RAGSnapshot
 
 LOGGER = Logger()
 
@@ -32,13 +33,31 @@ def rag_query(tool_name, args):
         - args      (parser.args): Parsed arguments.
     """
     base_url = args.base_url + ":" + args.port
-    builder = RAGBuilder(tool_name, args.src, args.db, args.llm, args.cle, base_url)
 
-    index = builder.get_index()
-
-    query = RAGQuery(tool_name, args.src, args.db, args.llm, args.cle, base_url, index)
-
-    query.run_query(args.debug)
+    builders = {}
+    if args.projects is None:
+        builder = RAGBuilder(
+            tool_name,
+            args.src,
+            args.db,
+            args.llm,
+            args.cle,
+            base_url,
+            args.keep_alive,
+            args.project,
+        )
+        builders[builder.project] = builder
+    else:
+        # existing projects are opened by name, no src path needed
+        for project in args.projects:
+            builders[project] = RAGBuilder(
+                tool_name, None, args.db, args.llm, args.cle, base_url, args.keep_alive, project
+            )
+
+    # indexes and models are loaded in background while the user types
+    query = RAGQuery(tool_name, args.db, args.llm, args.cle, base_url, builders, args.keep_alive)
+
+    query.run_query(args.debug, args.chat, args.history_tokens)
 
 
 def rag_builder(tool_name, args):
@@ -52,10 +71,14 @@ def rag_builder(tool_name, args):
         - args      (parser.args): Parsed arguments.
     """
     base_url = args.base_url + ":" + args.port
-    builder = RAGBuilder(tool_name, args.src, args.db, args.llm, args.cle, base_url)
+    builder = RAGBuilder(
+        tool_name, args.src, args.db, args.llm, args.cle, base_url, project=args.project
+    )
 
     if args.create:
-        builder.setup_index(args.hash_file, args.exclude, args.exclude_all, args.exclude_ext)
+        builder.setup_index(
+            args.hash_file, args.exclude, args.exclude_all, args.exclude_ext, args.summaries
+        )
 
     if args.update:
         builder.update_index(args.hash_file)
@@ -63,6 +86,63 @@ def rag_builder(tool_name, args):
     sys.exit(1)
 
 
+def rag_snapshot(tool_name, args):
+    """
+    RAG Snapshot operation mode.
+
+    Export or import a project's vector DB archive.
+
+    Arguments:
+        - tool_name (str): Tool's name.
+        - args      (parser.args): Parsed arguments.
+    """
+    base_url = args.base_url + ":" + args.port
+    snapshot = RAGSnapshot(tool_name, args.src, args.db, args.llm, args.cle, base_url, args.project)
+
+    if args.snapshot_mode == "export":
+        snapshot.export_snapshot(args.archive, args.hash_file)
+
+    if args.snapshot_mode == "import":
+        snapshot.import_snapshot(args.archive, args.hash_file, args.force)
+
+
+def keep_alive_type(value):
+    """
+    Parse keep alive CLI argument.
+
+    Ollama reads numbers as seconds and strings as durations with a unit,
+    a bare number sent as a string like "-1" is rejected.
+
+    Arguments:
+        - value (str): CLI value, e.g. -1, 300, 5m, 24h.
+
+    Returns:
+        - (int | float | str): Seconds as number, duration string otherwise.
+    """
+    for number_type in [int, float]:
+        try:
+            return number_type(value)
+        except ValueError:
+            pass
+    return value
+
+
+def projects_type(value):
+    """
+    Parse projects CLI argument.
+
+    Arguments:
+        - value (str): Comma separated project names, e.g. "auth, billing".
+
+    Returns:
+        - (list): Project names, stripped and without duplicates.
+    """
+    projects = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if len(projects) == 0:
+        raise argparse.ArgumentTypeError(f"no project name in {value!r}")
+    return projects
+
+
 def print_banner(tool_name):
     """
     Print Banner.
@@ -89,9 +169,17 @@ def parse_args(tool_name):
 
     tool_options = parser.add_argument_group(f"{tool_name} options")
     tool_options.add_argument(
-        "-s", "--src", type=str, required=True, help="Your project's src path."
+        "-s",
+        "--src",
+        type=str,
+        help="Your project's src path. Required unless guru is given a project name.",
     )
     tool_options.add_argument("--db", type=str, required=True, help="Chroma Vector DB path.")
+    tool_options.add_argument(
+        "--project",
+        type=str,
+        help="Project name, several projects can share one DB. [src dir name]",
+    )
 
     model_groups = parser.add_argument_group("Used models for operations.")
     model_groups.add_argument(
@@ -107,6 +195,18 @@ def parse_args(tool_name):
         help="Context Length Encoder for vector DB generation. [nomic-embed-text]",
     )
 
+    logging_options = parser.add_argument_group("Logging options")
+    verbosity = logging_options.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-q", "--quiet", action="store_true", help="Only show warnings and errors."
+    )
+    verbosity.add_argument(
+        "-v", "--verbose", action="store_true", help="Show debug messages, like every file."
+    )
+    logging_options.add_argument(
+        "--log-json", action="store_true", help="Write logs as JSON lines."
+    )
+
     ollama_options = parser.add_argument_group("Ollama options")
     ollama_options.add_argument(
         "-p", "--port", type=str, default="11434", help="Ollama server port. [11434]"
@@ -141,6 +241,13 @@ def parse_args(tool_name):
         help="Hashes file path. [project_hashes.json]",
     )
 
+    hash_file_options.add_argument(
+        "-S",
+        "--summaries",
+        action="store_true",
+        help="Index file and directory summaries, speeds up queries on large projects.",
+    )
+
     exclude_options = rag_builder_mode.add_argument_group("Exclude options.")
     exclude_options.add_argument(
         "-e",
@@ -162,8 +269,71 @@ def parse_args(tool_name):
     rag_query_mode.add_argument(
         "-d", "--debug", action="store_true", help="Show processed files chunks when answering."
     )
+    rag_query_mode.add_argument(
+        "-k",
+        "--keep-alive",
+        type=keep_alive_type,
+        default="5m",
+        help="How long Ollama keeps the LLM loaded between questions, -1 forever. [5m]",
+    )
+    rag_query_mode.add_argument(
+        "-c",
+        "--chat",
+        action="store_true",
+        help="Conversation mode, follow-up questions keep the previous context.",
+    )
+    rag_query_mode.add_argument(
+        "--history-tokens",
+        type=int,
+        default=1024,
+        help="Conversation history budget, older turns are summarized. [1024]",
+    )
+    rag_query_mode.add_argument(
+        "--projects",
+        type=projects_type,
+        help="Comma separated projects of the DB to query together. [proj_a,proj_b]",
+    )
+
+    rag_snapshot_mode = subparsers.add_parser(
+        "snapshot", help="Share the guru's knowledge without re-learning."
+    )
+    snapshot_subparsers = rag_snapshot_mode.add_subparsers(
+        title="Snapshot operations", dest="snapshot_mode", required=True
+    )
+    snapshot_export = snapshot_subparsers.add_parser(
+        "export", help="Pack DB, hash file and embedding model metadata into an archive."
+    )
+    snapshot_import = snapshot_subparsers.add_parser(
+        "import", help="Load an archive into an empty DB, then use learning --update."
+    )
+    for snapshot_op in [snapshot_export, snapshot_import]:
+        snapshot_op.add_argument(
+            "-a", "--archive", type=str, required=True, help="Snapshot archive path. [.tar.gz]"
+        )
+        snapshot_op.add_argument(
+            "-f",
+            "--hash-file",
+            type=str,
+            default="project_hashes.json",
+            help="Hashes file path. [project_hashes.json]",
+        )
+    snapshot_import.add_argument(
+        "--force",
+        action="store_true",
+        help="Import even if the snapshot embedding model differs from --cle.",
+    )
+
+    args = parser.parse_args()
 
-    return parser.parse_args()
+    if args.mode == "guru" and args.projects is not None:
+        if args.src is not None or args.project is not None:
+            parser.error("-s/--src and --project can't be used with --projects")
+
+    by_name = args.mode == "guru" and (args.project is not None or args.projects is not None)
+    if args.src is None and not by_name:
+        parser.error("-s/--src is required, except for guru with --project or --projects")
+
+    return args
 
 
 def main():
@@ -175,12 +345,22 @@ def main():
 
     args = parse_args(tool_name)
 
+    level = logging.INFO
+    if args.quiet:
+        level = logging.WARNING
+    if args.verbose:
+        level = logging.DEBUG
+    Logger.configure(level, args.log_json)
+
     if args.mode == "learning":
         rag_builder(tool_name, args)
 
     if args.mode == "guru":
         rag_query(tool_name, args)
 
+    if args.mode == "snapshot":
+        rag_snapshot(tool_name, args)
+
 
 if __name__ == "__main__":
     main()
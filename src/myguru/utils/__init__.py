@@ -1,5 +1,19 @@
 """Init file."""
 
-from myguru.utils.utils import md5, read_hash_file, walk_directory, write_hash_file
+from myguru.utils.utils import (
+    collection_name,
+    md5,
+    read_hash_file,
+    sha256,
+    walk_directory,
+    write_hash_file,
+)
 
-__all__ = ["walk_directory", "md5", "write_hash_file", "read_hash_file"]
+__all__ = [
+    "walk_directory",
+    "md5",
+    "sha256",
+    "write_hash_file",
+    "read_hash_file",
+    "collection_name",
+]
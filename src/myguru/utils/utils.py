@@ -3,6 +3,7 @@
 import hashlib
 import json
 import os
+import re
 
 
 def read_hash_file(hash_file):
@@ -56,6 +57,42 @@ def md5(file_path):
         return hashlib.md5(pfile.read()).hexdigest()
 
 
+def sha256(file_path):
+    """
+    Create file sha256 hash.
+
+    Reads the file in blocks, used for big files like snapshot archives members.
+
+    Arguments:
+        - file_path (str): File path.
+
+    Returns:
+        - sha256 (hash): File's sha256 hash.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as pfile:
+        for block in iter(lambda: pfile.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collection_name(project):
+    """
+    Get a project's Chroma collection name.
+
+    The readable part is sanitized to Chroma's allowed characters, the hash
+    keeps names like 'my project' and 'my-project' from colliding.
+
+    Arguments:
+        - project (str): Project name.
+
+    Returns:
+        - (str): Collection name.
+    """
+    slug = re.sub(r"[^a-zA-Z0-9_-]+", "-", project).strip("-_")[:48] or "project"
+    return f"{slug}-{hashlib.md5(project.encode('utf-8')).hexdigest()[:8]}"
+
+
 def norm_file_path(files):
     """
     Nomralize file paths.
@@ -0,0 +1,59 @@
+"""Shared fixtures, real Chroma DBs with offline models instead of Ollama."""
+
+import hashlib
+import os
+import re
+
+import pytest
+from llama_index.core import Settings
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.llms import MockLLM
+
+OLLAMA_URL = "http://localhost:11434"
+
+
+class BowEmbedding(BaseEmbedding):
+    """Hashed bag of words embedding, texts sharing words are close."""
+
+    def _vector(self, text):
+        vector = [0.0] * 64
+        for word in re.findall(r"[a-z]+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+    def _get_query_embedding(self, query):
+        return self._vector(query)
+
+    async def _aget_query_embedding(self, query):
+        return self._vector(query)
+
+    def _get_text_embedding(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture(name="offline_models")
+def fixture_offline_models():
+    """Replace the Ollama models RAGBase sets, call it after creating RAG objects."""
+
+    def apply():
+        Settings.embed_model = BowEmbedding()
+        # echoes the prompt, summaries keep the summarized content
+        Settings.llm = MockLLM()
+
+    return apply
+
+
+@pytest.fixture(name="make_project")
+def fixture_make_project():
+    """Write a source tree, returns its src path."""
+
+    def make(root, files):
+        for path, content in files.items():
+            file_path = os.path.join(root, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as pfile:
+                pfile.write(content + "\n")
+        return str(root)
+
+    return make
@@ -0,0 +1,165 @@
+"""Chat Memory tests."""
+
+import pytest
+
+from myguru.cls.chat_memory import ChatMemory
+
+
+class FakeLogger:
+    """Collect log messages."""
+
+    def __init__(self):
+        self.warnings = []
+
+    def debug(self, mssg):
+        """Ignore debug messages."""
+
+    def warning(self, mssg):
+        """Store warning messages."""
+        self.warnings.append(mssg)
+
+
+class FakeSummarizer:
+    """Record summarization calls and return a fixed summary."""
+
+    def __init__(self, summary="summary"):
+        self.summary = summary
+        self.calls = []
+
+    def __call__(self, conversation, max_words):
+        self.calls.append((conversation, max_words))
+        return self.summary
+
+
+def wait(memory):
+    """Wait for the background summaries, including the chained ones."""
+    while True:
+        with memory._lock:
+            pending = memory._pending
+        if pending is None:
+            return
+        pending.result()
+
+
+@pytest.fixture(name="memory")
+def fixture_memory():
+    """Memory holding one turn about read_hash_file."""
+    memory = ChatMemory(1024, FakeSummarizer(), FakeLogger())
+    memory.add_turn(
+        "what does read_hash_file do?", "It loads the JSON hash file.", ["n1", "n2", "n3", "n4"]
+    )
+    yield memory
+    memory.close()
+
+
+def test_is_follow_up_without_history():
+    memory = ChatMemory(1024, FakeSummarizer(), FakeLogger())
+    assert not memory.is_follow_up("and where is that called?")
+
+
+@pytest.mark.parametrize(
+    "user_prompt",
+    [
+        "how is the hash file written?",
+        "why does setup_index exit with code 0?",
+        "what is this project about?",
+        "and what does walk_directory skip?",
+        "where is read_hash_file called?",
+        "what does it do " + "and then " * 6,
+    ],
+)
+def test_is_not_follow_up(memory, user_prompt):
+    assert not memory.is_follow_up(user_prompt)
+
+
+@pytest.mark.parametrize(
+    "user_prompt",
+    [
+        "and where is that called?",
+        "what does it return?",
+        "what does that mean?",
+        "then who calls read_hash_file?",
+        "why this?",
+    ],
+)
+def test_is_follow_up(memory, user_prompt):
+    assert memory.is_follow_up(user_prompt)
+
+
+def test_retrieval_query(memory):
+    query_str, reused = memory.retrieval_query("and where is that called?")
+    assert query_str == "what does read_hash_file do?\nand where is that called?"
+    assert reused == ["n1", "n2", "n3"]
+
+    assert memory.retrieval_query("how is the hash file written?") == (
+        "how is the hash file written?",
+        [],
+    )
+
+
+def test_add_turn_truncates_answer():
+    memory = ChatMemory(10, FakeSummarizer(), FakeLogger())
+    memory.add_turn("question", "x" * 1000, [])
+    assert memory.turns == [("question", "x" * (10 * ChatMemory.CHARS_PER_TOKEN // 2))]
+    memory.close()
+
+
+def test_compress_summarizes_oldest_turns():
+    summarizer = FakeSummarizer()
+    memory = ChatMemory(100, summarizer, FakeLogger())
+
+    # ~36 tokens per turn, two fit in the 75 tokens left beside the summary
+    for i in range(3):
+        memory.add_turn(f"q{i}", "a" * 120, [])
+    wait(memory)
+
+    assert [turn[0] for turn in memory.turns] == ["q1", "q2"]
+    assert memory.summarizing == []
+    assert memory.summary == "summary"
+
+    conversation, max_words = summarizer.calls[0]
+    assert "[user] > q0" in conversation
+    assert max_words == 100 // 4 * 3 // 4
+
+    assert memory.prompt("q3").startswith(
+        "Conversation so far:\nSummary of the earlier conversation: summary\n[user] > q1"
+    )
+    memory.close()
+
+
+def test_compress_keeps_last_turn():
+    summarizer = FakeSummarizer()
+    memory = ChatMemory(10, summarizer, FakeLogger())
+    memory.add_turn("question", "x" * 20, [])
+    wait(memory)
+
+    assert len(memory.turns) == 1
+    assert summarizer.calls == []
+    memory.close()
+
+
+def test_summary_is_truncated():
+    memory = ChatMemory(100, FakeSummarizer("s" * 1000), FakeLogger())
+    for i in range(3):
+        memory.add_turn(f"q{i}", "a" * 120, [])
+    wait(memory)
+
+    assert memory.summary == "s" * (100 * ChatMemory.CHARS_PER_TOKEN // 4)
+    memory.close()
+
+
+def test_failed_summary_keeps_previous_summary():
+    def summarize(conversation, max_words):
+        raise RuntimeError("ollama down")
+
+    logger = FakeLogger()
+    memory = ChatMemory(100, summarize, logger)
+    memory.summary = "earlier"
+    for i in range(3):
+        memory.add_turn(f"q{i}", "a" * 120, [])
+    wait(memory)
+
+    assert memory.summary == "earlier"
+    assert [turn[0] for turn in memory.turns] == ["q1", "q2"]
+    assert logger.warnings == ["Conversation summary failed: ollama down"]
+    memory.close()
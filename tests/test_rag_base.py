@@ -0,0 +1,75 @@
+"""RAG Base tests."""
+
+import os
+
+import chromadb
+import pytest
+from conftest import OLLAMA_URL
+
+from myguru.cls import RAGBuilder
+from myguru.utils import collection_name
+
+
+@pytest.fixture(name="legacy_db")
+def fixture_legacy_db(tmp_path, make_project):
+    """DB learned before projects, its collection is named after svc/billing/src."""
+    make_project(tmp_path / "svc" / "billing" / "src", {"b.py": "def bill(): invoice"})
+    make_project(tmp_path / "svc" / "auth" / "src", {"a.py": "def login(): password"})
+
+    db_path = str(tmp_path / "db")
+    legacy = chromadb.PersistentClient(path=db_path).create_collection(name="src")
+    legacy.add(
+        ids=["chunk"],
+        embeddings=[[1.0, 0.0]],
+        documents=["def bill(): invoice"],
+        metadatas=[{"file_path": str(tmp_path / "svc" / "billing" / "src" / "b.py")}],
+    )
+    return db_path
+
+
+def collections(db_path):
+    """Collection name -> metadata."""
+    client = chromadb.PersistentClient(path=db_path)
+    return {collection.name: collection.metadata for collection in client.list_collections()}
+
+
+@pytest.mark.parametrize("project", [None, "src"])
+def test_legacy_collection_adopted(tmp_path, legacy_db, project):
+    src_path = str(tmp_path / "svc" / "billing" / "src")
+    builder = RAGBuilder("myguru", src_path, legacy_db, "llm", "cle", OLLAMA_URL, project=project)
+
+    assert builder.chroma_collection.name == collection_name("src")
+    assert builder.chroma_collection.count() == 1
+    assert collections(legacy_db) == {
+        collection_name("src"): {"project": "src", "src": os.path.abspath(src_path)}
+    }
+
+
+def test_legacy_collection_kept_for_another_project(tmp_path, legacy_db):
+    src_path = str(tmp_path / "svc" / "auth" / "src")
+    builder = RAGBuilder("myguru", src_path, legacy_db, "llm", "cle", OLLAMA_URL, project="auth")
+
+    assert builder.chroma_collection is None
+    assert collections(legacy_db) == {"src": None}
+
+
+def test_legacy_collection_kept_for_another_src(tmp_path, legacy_db):
+    # same src dir name, but the legacy chunks come from svc/billing/src
+    src_path = str(tmp_path / "svc" / "auth" / "src")
+    builder = RAGBuilder("myguru", src_path, legacy_db, "llm", "cle", OLLAMA_URL)
+
+    assert builder.chroma_collection is None
+    assert collections(legacy_db) == {"src": None}
+
+
+def test_learning_next_to_legacy_collection(tmp_path, legacy_db, offline_models):
+    src_path = str(tmp_path / "svc" / "auth" / "src")
+    builder = RAGBuilder("myguru", src_path, legacy_db, "llm", "cle", OLLAMA_URL, project="auth")
+    offline_models()
+    builder.setup_index(str(tmp_path / "hashes.json"), [], [], [])
+
+    chunks = builder.chroma_collection.get(include=["metadatas"])
+    assert [metadata["file_path"] for metadata in chunks["metadatas"]] == [
+        os.path.join(src_path, "a.py")
+    ]
+    assert collections(legacy_db)["src"] is None
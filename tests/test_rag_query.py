@@ -0,0 +1,52 @@
+"""RAG Query tests."""
+
+import pytest
+from conftest import OLLAMA_URL
+from llama_index.core import QueryBundle, Settings
+
+from myguru.cls import RAGBuilder, RAGQuery
+
+FILES = {
+    "main.py": "def main(): parse command line arguments entry point",
+    "pkg/db/store.py": "def save_record(): database storage record",
+    "pkg/net/sock.py": "def send_packet(): network socket packet",
+}
+
+
+def bundle(query_str):
+    """Embed a query like RAGQuery._retrieve does."""
+    return QueryBundle(query_str, embedding=Settings.embed_model.get_query_embedding(query_str))
+
+
+@pytest.fixture(name="query")
+def fixture_query(tmp_path, make_project, offline_models):
+    """Query over a project learned with summaries."""
+    src_path = make_project(tmp_path / "proj", FILES)
+    db_path = str(tmp_path / "db")
+
+    builder = RAGBuilder("myguru", src_path, db_path, "llm", "cle", OLLAMA_URL)
+    offline_models()
+    builder.setup_index(str(tmp_path / "hashes.json"), [], [], [], summaries=True)
+
+    builders = {"proj": RAGBuilder("myguru", None, db_path, "llm", "cle", OLLAMA_URL, "5m", "proj")}
+    query = RAGQuery("myguru", db_path, "llm", "cle", OLLAMA_URL, builders, "5m")
+    offline_models()
+    query._wait_warm_up()
+
+    yield query
+    query._retrieval_executor.shutdown()
+
+
+def test_scope_files_keeps_root_files(query, tmp_path):
+    main_path = str(tmp_path / "proj" / "main.py")
+
+    files = query._scope_files("proj", bundle("command line arguments entry"))
+    assert main_path in files
+
+    nodes = query._retrieve("command line arguments entry", False)
+    assert nodes[0].node.metadata["file_path"] == main_path
+
+
+def test_scope_files_keeps_files_under_picked_dirs(query, tmp_path):
+    files = query._scope_files("proj", bundle("network socket packet"))
+    assert str(tmp_path / "proj" / "pkg" / "net" / "sock.py") in files
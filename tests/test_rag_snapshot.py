@@ -0,0 +1,114 @@
+"""RAG Snapshot tests."""
+
+import os
+import shutil
+
+import pytest
+from conftest import OLLAMA_URL
+
+from myguru.cls import RAGBuilder, RAGSnapshot
+from myguru.utils import read_hash_file
+
+FILES = {
+    "main.py": "def main(): parse command line arguments entry point",
+    "pkg/db/store.py": "def save_record(): database storage record",
+    "pkg/net/sock.py": "def send_packet(): network socket packet",
+}
+
+
+@pytest.fixture(name="archive")
+def fixture_archive(tmp_path, make_project, offline_models):
+    """Snapshot of a project learned with summaries."""
+    src_path = make_project(tmp_path / "exporter" / "proj", FILES)
+    db_path = str(tmp_path / "exporter" / "db")
+    hash_file = str(tmp_path / "exporter" / "hashes.json")
+
+    builder = RAGBuilder("myguru", src_path, db_path, "llm", "cle", OLLAMA_URL)
+    offline_models()
+    builder.setup_index(hash_file, [], [], [], summaries=True)
+
+    archive = str(tmp_path / "snapshot.tar.gz")
+    RAGSnapshot("myguru", src_path, db_path, "llm", "cle", OLLAMA_URL).export_snapshot(
+        archive, hash_file
+    )
+    return archive
+
+
+@pytest.fixture(name="importer")
+def fixture_importer(tmp_path, make_project):
+    """Same project checked out at another path."""
+    src_path = make_project(tmp_path / "importer" / "proj", FILES)
+    return src_path, str(tmp_path / "importer" / "db"), str(tmp_path / "importer" / "hashes.json")
+
+
+def import_snapshot(archive, src_path, db_path, hash_file):
+    """Import a snapshot, returns the RAGSnapshot object."""
+    snapshot = RAGSnapshot("myguru", src_path, db_path, "llm", "cle", OLLAMA_URL)
+    snapshot.import_snapshot(archive, hash_file, False)
+    return snapshot
+
+
+def test_import_rebases_paths(archive, importer):
+    src_path, db_path, hash_file = importer
+    snapshot = import_snapshot(archive, src_path, db_path, hash_file)
+
+    assert sorted(read_hash_file(hash_file)) == sorted(
+        os.path.join(src_path, path) for path in FILES
+    )
+
+    chunk = snapshot.chroma_collection.get(
+        where={"file_path": os.path.join(src_path, "main.py")}, include=["documents"]
+    )
+    assert chunk["documents"][0].startswith(f"File Path: {src_path}/main.py\n")
+
+    summary = snapshot.summary_collection.get(
+        where={"path": os.path.join(src_path, "pkg", "net", "sock.py")}, include=["metadatas"]
+    )
+    metadata = summary["metadatas"][0]
+    assert metadata["doc_id"] == f"file:{src_path}/pkg/net/sock.py"
+    assert metadata["dir_1"] == os.path.join(src_path, "pkg")
+    assert metadata["dir_2"] == os.path.join(src_path, "pkg", "net")
+    assert "exporter" not in metadata["_node_content"]
+
+
+def test_update_after_import(archive, importer, offline_models):
+    src_path, db_path, hash_file = importer
+    import_snapshot(archive, src_path, db_path, hash_file)
+
+    changed = os.path.join(src_path, "pkg", "db", "store.py")
+    with open(changed, "a", encoding="utf-8") as pfile:
+        pfile.write("def delete_record(): database removal\n")
+
+    builder = RAGBuilder("myguru", src_path, db_path, "llm", "cle", OLLAMA_URL)
+    offline_models()
+    builder.update_index(hash_file)
+
+    # the imported chunk and summary were replaced, not duplicated
+    chunks = builder.chroma_collection.get(where={"file_path": changed}, include=["documents"])
+    assert len(chunks["ids"]) == 1
+    assert "delete_record" in chunks["documents"][0]
+    assert builder.chroma_collection.count() == len(FILES)
+
+    summaries = builder.summary_collection.get(where={"path": changed}, include=["documents"])
+    assert len(summaries["ids"]) == 1
+    assert "delete_record" in summaries["documents"][0]
+
+
+def test_import_refuses_missing_files(archive, importer):
+    src_path, db_path, hash_file = importer
+    shutil.rmtree(os.path.join(src_path, "pkg"))
+
+    with pytest.raises(SystemExit):
+        import_snapshot(archive, src_path, db_path, hash_file)
+    assert not os.path.exists(hash_file)
+
+
+def test_import_refuses_existing_hash_file(archive, importer):
+    src_path, db_path, hash_file = importer
+    with open(hash_file, "w", encoding="utf-8") as pfile:
+        pfile.write("{}")
+
+    with pytest.raises(SystemExit):
+        import_snapshot(archive, src_path, db_path, hash_file)
+    with open(hash_file, "r", encoding="utf-8") as pfile:
+        assert pfile.read() == "{}"